@@ -8,11 +8,10 @@ Copyright 2025 Shane Burkhardt
 
 import os
 import json
-import urllib.request
-import urllib.parse
-import urllib.error
+import heapq
 import sys
 import subprocess
+import threading
 import time
 import yaml
 import requests
@@ -20,6 +19,10 @@ import math
 import curses
 import textwrap
 import xml.etree.ElementTree as ET
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from configobj import ConfigObj
 from typing import Dict, List, Optional, Any, Tuple
 
@@ -27,6 +30,7 @@ from typing import Dict, List, Optional, Any, Tuple
 try:
     from weecfg.extension import ExtensionInstaller
     import weewx.manager
+    import weedb
     import weewx
     import weeutil.logger
     log = weeutil.logger.logging.getLogger(__name__)
@@ -34,6 +38,21 @@ except ImportError:
     print("Error: This installer requires WeeWX 5.1 or later")
     sys.exit(1)
 
+# Optional streaming JSON parser for the large CO-OPS station lists; needs
+# ijson 3.1+ for use_float, older releases fall back to response.json()
+try:
+    import ijson
+    if tuple(int(part) for part in ijson.__version__.split('.')[:2]) < (3, 1):
+        ijson = None
+except (ImportError, AttributeError, ValueError):
+    ijson = None
+
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YamlSafeLoader
+except ImportError:
+    from yaml import SafeLoader as YamlSafeLoader
+
 # FIXED: Standardized icon usage (only 4 core icons)
 CORE_ICONS = {
     'navigation': '📍',    # Location/station selection
@@ -42,6 +61,93 @@ CORE_ICONS = {
     'selection': '🔧'      # Configuration/selection
 }
 
+# NDBC capability groups worth offering to the user (shared, immutable)
+NDBC_USEFUL_CAPABILITIES = ('Atmospheric Data', 'Wave Data', 'Ocean Temperature')
+
+# NDBC .txt field names grouped by natural sensor type
+NDBC_SENSOR_GROUPS = (
+    ('Atmospheric Data', ('WDIR', 'WSPD', 'GST', 'PRES', 'ATMP', 'DEWP', 'VIS')),
+    ('Wave Data', ('WVHT', 'DPD', 'APD', 'MWD')),
+    ('Ocean Temperature', ('WTMP',))
+)
+
+# NDBC missing-data markers (text and numeric forms)
+NDBC_MISSING_INDICATORS = frozenset(('MM', '999.0', '99.0', 'MM.'))
+NDBC_MISSING_VALUES = frozenset((999.0, 99.0, -999.0))
+
+# CO-OPS station list keys kept on discovered station records; the expanded
+# API records also carry nested details and resource links that are never read
+COOPS_STATION_KEYS = ('id', 'name', 'state', 'lat', 'lng')
+
+# Concurrent NDBC .txt fetches when probing station capabilities
+NDBC_PROBE_WORKERS = 8
+
+# Private per-user cache directory for data kept across installer runs
+MARINE_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'weewx-marine')
+
+# Parsed marine_data_fields.yaml, reused while the YAML path, mtime and size match
+YAML_PARSE_CACHE = os.path.join(MARINE_CACHE_DIR, 'marine_data_fields.json')
+
+# CO-OPS station capabilities cached across installer runs
+COOPS_CAPABILITY_CACHE = os.path.join(MARINE_CACHE_DIR, 'coops_capabilities.json')
+COOPS_CAPABILITY_CACHE_TTL = 30 * 24 * 3600  # 30 days
+
+# Per-request timeout for CO-OPS capability lookups, and the extra time the
+# station page waits for lookups still in flight when the user presses ENTER
+COOPS_CAPABILITY_TIMEOUT = 10
+COOPS_CAPABILITY_JOIN_MARGIN = 5
+
+# SQLite pragmas for the installer's schema connection. Connection-scoped only:
+# journal_mode=WAL is deliberately not set because it persists in the user's
+# weewx database file and would change how WeeWX itself opens it.
+SQLITE_INSTALL_PRAGMAS = (
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA cache_size=-20000'
+)
+
+# Per-table schema beyond the YAML fields: (operational columns, constraints).
+# Operational columns are the ones marine_data.py writes itself; key lengths
+# on TEXT columns keep the constraints MySQL-compatible.
+MARINE_TABLE_SCHEMAS = {
+    'coops_realtime': (
+        (),
+        ('PRIMARY KEY (dateTime, station_id(20))',
+         'INDEX idx_recent_coops (station_id(20), dateTime)')
+    ),
+    'tide_table': (
+        ('tide_time INTEGER NOT NULL',
+         'tide_type TEXT NOT NULL',
+         'predicted_height REAL',
+         'datum TEXT',
+         'days_ahead INTEGER'),
+        ('PRIMARY KEY (station_id(20), tide_time, tide_type(1))',
+         'INDEX idx_upcoming_tides (station_id(20), tide_time)')
+    ),
+    'ndbc_data': (
+        (),
+        ('PRIMARY KEY (dateTime, station_id(20))',
+         'INDEX idx_recent_ndbc (station_id(20), dateTime)')
+    )
+}
+
+# Default collection intervals (seconds, as config strings) written for the service
+DEFAULT_COLLECTION_INTERVALS = {
+    'coops_collection_interval': '600',      # 10 minutes
+    'tide_predictions_interval': '21600',    # 6 hours
+    'ndbc_weather_interval': '3600',         # 1 hour
+    'ndbc_ocean_interval': '3600'            # 1 hour
+}
+
+# 16-point compass rose, clockwise from north
+CARDINAL_DIRECTIONS = (
+    'N', 'NNE', 'NE', 'ENE', 'E', 'ESE', 'SE', 'SSE',
+    'S', 'SSW', 'SW', 'WSW', 'W', 'WNW', 'NW', 'NNW'
+)
+
+# Pre-formatted field display row used by the curses field selection screen
+FieldRow = namedtuple('FieldRow', 'name label desc_line')
+
 # REQUIRED: Loader function for WeeWX extension system
 def loader():
     return MarineDataInstaller()
@@ -192,43 +298,46 @@ class MarineDataInstaller(ExtensionInstaller):
             if not hasattr(configurator, 'yaml_data') or not configurator.yaml_data:
                 raise RuntimeError("marine_data_fields.yaml not loaded or empty")
             
-            # Get fields from YAML (correct structure)
-            fields = configurator.yaml_data.get('fields', {})
-            if not fields:
+            # Get resolved field mappings from YAML (correct structure)
+            field_mappings = configurator.field_mappings
+            if not field_mappings:
                 raise RuntimeError("Field definitions not found in marine_data_fields.yaml")
             
-            # Group fields by database_table to determine what tables to create
-            tables_to_create = set()
-            for field_name, field_config in fields.items():
-                table_name = field_config.get('database_table', 'archive')
-                if table_name != 'archive':  # Skip archive table
-                    tables_to_create.add(table_name)
+            # Group fields by database_table in one pass: {table_name: {db_field: db_type}}
+            tables_to_create = {}
+            for field_mapping in field_mappings.values():
+                table_name = field_mapping['database_table']
+                if table_name == 'archive':  # Skip archive table
+                    continue
+                table_fields = tables_to_create.get(table_name)
+                if table_fields is None:
+                    # Add standard fields that all tables need
+                    table_fields = tables_to_create[table_name] = {
+                        'dateTime': 'INTEGER NOT NULL',
+                        'station_id': 'TEXT NOT NULL'
+                    }
+                table_fields[field_mapping['database_field']] = field_mapping['database_type']
             
             # Use WeeWX database manager instead of custom connections
             with weewx.manager.open_manager_with_config(engine.config_dict, 'wx_binding') as manager:
                 
-                # Create each required table based on YAML field mappings
-                for table_name in tables_to_create:
-                    # Build field list for this table from YAML
-                    table_fields = {}
-                    
-                    # Add standard fields that all tables need
-                    table_fields['dateTime'] = 'INTEGER NOT NULL'
-                    table_fields['station_id'] = 'TEXT NOT NULL'
-                    
-                    # Add fields defined in YAML for this table
-                    for field_name, field_config in fields.items():
-                        if field_config.get('database_table') == table_name:
-                            db_field = field_config.get('database_field', field_name)
-                            db_type = field_config.get('database_type', 'REAL')
-                            table_fields[db_field] = db_type
+                # SQLite: per-connection write tuning (must be set outside a transaction)
+                if manager.connection.dbtype == 'sqlite':
+                    for pragma in SQLITE_INSTALL_PRAGMAS:
+                        manager.connection.execute(pragma)
+                
+                # CREATE TABLE IF NOT EXISTS is a no-op for existing tables, so skip
+                # their DDL entirely (one catalog query instead of one statement each)
+                existing_tables = set(manager.connection.tables())
+                
+                # All DDL in one explicit transaction: one commit instead of one per statement
+                with weedb.Transaction(manager.connection):
                     
-                    if table_name == 'coops_realtime':
-                        self._create_coops_realtime_table(manager, table_fields)
-                    elif table_name == 'tide_table':
-                        self._create_tide_table(manager, table_fields)
-                    elif table_name == 'ndbc_data':
-                        self._create_ndbc_data_table(manager, table_fields)
+                    # Create each required table based on YAML field mappings
+                    for table_name, table_fields in tables_to_create.items():
+                        if table_name in existing_tables or table_name not in MARINE_TABLE_SCHEMAS:
+                            continue
+                        self._create_marine_table(manager, table_name, table_fields)
             
             print(f"{CORE_ICONS['status']} Marine tables created successfully from YAML field definitions")
             
@@ -236,110 +345,23 @@ class MarineDataInstaller(ExtensionInstaller):
             print(f"{CORE_ICONS['warning']} Error creating marine tables: {e}")
             raise
 
-    def _determine_required_tables_from_yaml(self, config_dict):
+    def _create_marine_table(self, manager, table_name, table_fields):
         """
-        PRESERVE: DATA-DRIVEN table determination from YAML field mappings
+        DATA-DRIVEN: Create a marine table from YAML field definitions plus its
+        entry in MARINE_TABLE_SCHEMAS (operational columns and constraints)
         """
-        required_tables = set()
-        
-        # PRESERVE: Use existing field_mappings pattern from config_dict
-        field_mappings = config_dict.get('MarineDataService', {}).get('field_mappings', {})
+        operational_fields, constraints = MARINE_TABLE_SCHEMAS[table_name]
         
-        for module_name, module_fields in field_mappings.items():
-            if isinstance(module_fields, dict):
-                for service_field, field_config in module_fields.items():
-                    if isinstance(field_config, dict):
-                        table_name = field_config.get('database_table', 'archive')
-                        if table_name != 'archive':
-                            required_tables.add(table_name)
-        
-        return required_tables
-
-    def _create_coops_realtime_table(self, manager, table_fields):
-        """
-        DATA-DRIVEN: Create coops_realtime table using YAML field definitions
-        """
-        # Build field definitions from YAML
-        field_definitions = []
-        for field_name, field_type in table_fields.items():
-            field_definitions.append(f"{field_name} {field_type}")
-        
-        # Add table constraints with MySQL-compatible key length
-        constraints = [
-            "PRIMARY KEY (dateTime, station_id(20))",
-            "INDEX idx_recent_coops (station_id(20), dateTime)"
-        ]
-        
-        # Combine fields and constraints
-        all_definitions = field_definitions + constraints
-        
-        # Create table with YAML-defined fields
-        create_sql = f"""
-            CREATE TABLE IF NOT EXISTS coops_realtime (
-                {', '.join(all_definitions)}
-            )
-        """
-        manager.connection.execute(create_sql)
-
-    def _create_tide_table(self, manager, table_fields):
-        """
-        DATA-DRIVEN: Create tide_table using YAML field definitions + required operational fields
-        """
-        # Build field definitions from YAML user-facing fields
-        field_definitions = []
-        for field_name, field_type in table_fields.items():
-            field_definitions.append(f"{field_name} {field_type}")
-        
-        # Add required operational fields that marine_data.py service uses
-        operational_fields = [
-            "tide_time INTEGER NOT NULL",
-            "tide_type TEXT NOT NULL", 
-            "predicted_height REAL",
-            "datum TEXT",
-            "days_ahead INTEGER"
-        ]
-        
-        # Combine YAML fields + operational fields
-        all_field_definitions = field_definitions + operational_fields
-        
-        # Use operational fields for primary key with MySQL-compatible key length
-        constraints = [
-            "PRIMARY KEY (station_id(20), tide_time, tide_type(1))",
-            "INDEX idx_upcoming_tides (station_id(20), tide_time)"
-        ]
-        
-        # Combine fields and constraints
-        all_definitions = all_field_definitions + constraints
-        
-        # Create table with YAML + operational fields
-        create_sql = f"""
-            CREATE TABLE IF NOT EXISTS tide_table (
-                {', '.join(all_definitions)}
-            )
-        """
-        manager.connection.execute(create_sql)
-
-    def _create_ndbc_data_table(self, manager, table_fields):
-        """
-        DATA-DRIVEN: Create ndbc_data table using YAML field definitions
-        """
-        # Build field definitions from YAML
-        field_definitions = []
-        for field_name, field_type in table_fields.items():
-            field_definitions.append(f"{field_name} {field_type}")
-        
-        # Add table constraints with MySQL-compatible key length
-        constraints = [
-            "PRIMARY KEY (dateTime, station_id(20))",
-            "INDEX idx_recent_ndbc (station_id(20), dateTime)"
-        ]
-        
-        # Combine fields and constraints
-        all_definitions = field_definitions + constraints
+        # YAML fields + operational fields + constraints, joined in a single pass
+        all_definitions = (
+            *(f"{field_name} {field_type}" for field_name, field_type in table_fields.items()),
+            *operational_fields,
+            *constraints
+        )
         
         # Create table with YAML-defined fields
         create_sql = f"""
-            CREATE TABLE IF NOT EXISTS ndbc_data (
+            CREATE TABLE IF NOT EXISTS {table_name} (
                 {', '.join(all_definitions)}
             )
         """
@@ -362,7 +384,18 @@ class MarineDataConfigurator:
         self.selected_stations = {}
         self.selected_fields = {}
         self.yaml_data = {}
+        # Shared HTTP session: keep-alive reuses one TLS connection per NOAA host,
+        # and transient gateway errors are retried with backoff
+        self.session = requests.Session()
+        retry = Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+        adapter = HTTPAdapter(max_retries=retry, pool_maxsize=16)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        # Capability cache is loaded on first use; lookups run on background threads
+        self.capability_cache = None
+        self.capability_cache_lock = threading.Lock()
         self._load_yaml_configuration()
+        self._index_yaml_data()
 
     def _load_yaml_configuration(self):
         """
@@ -384,30 +417,90 @@ class MarineDataConfigurator:
                 # Build path to YAML file using WeeWX methodology
                 yaml_path = os.path.join(weewx_root, user_root, 'marine_data_fields.yaml')
                 
-                print(f"DEBUG: WeeWX engine available")
-                print(f"DEBUG: Config file: {config_dict.filename}")
-                print(f"DEBUG: WEEWX_ROOT: {weewx_root}")
-                print(f"DEBUG: USER_ROOT: {user_root}")
-                print(f"DEBUG: YAML path: {yaml_path}")
-                print(f"DEBUG: YAML exists: {os.path.exists(yaml_path)}")
+                log.debug(f"Config file: {config_dict.filename}")
+                log.debug(f"WEEWX_ROOT: {weewx_root}, USER_ROOT: {user_root}")
+                log.debug(f"YAML path: {yaml_path}")
                 
                 if os.path.exists(yaml_path):
-                    with open(yaml_path, 'r') as file:
-                        self.yaml_data = yaml.safe_load(file)
-                        print(f"DEBUG: YAML loaded successfully, keys: {list(self.yaml_data.keys())}")
+                    self.yaml_data = self._read_yaml_with_cache(yaml_path)
+                    log.debug(f"YAML loaded, keys: {list(self.yaml_data.keys())}")
                 else:
-                    print("DEBUG: YAML file not found at WeeWX path")
+                    log.error(f"marine_data_fields.yaml not found at {yaml_path}")
                     self.yaml_data = {}
             else:
-                print("DEBUG: No WeeWX engine available")
+                log.debug("No WeeWX engine available, YAML not loaded")
                 self.yaml_data = {}
                     
         except Exception as e:
-            print(f"DEBUG: YAML loading error: {e}")
-            import traceback
-            traceback.print_exc()
+            log.error(f"YAML loading error: {e}", exc_info=True)
             self.yaml_data = {}
 
+    def _read_yaml_with_cache(self, yaml_path):
+        """
+        Parse the YAML file, reusing the JSON copy in YAML_PARSE_CACHE while it is current
+        
+        The cache records the YAML path, mtime_ns and size it was built from and
+        is rewritten atomically whenever they differ. It lives in the user's
+        cache directory, never in the WeeWX tree; failing to read or write it
+        only costs a normal YAML parse.
+        """
+        yaml_stat = os.stat(yaml_path)
+        source = [yaml_path, yaml_stat.st_mtime_ns, yaml_stat.st_size]
+        
+        try:
+            with open(YAML_PARSE_CACHE, 'r') as file:
+                cache = json.load(file)
+            if cache.get('source') == source:
+                return cache['data']
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass  # Missing or unusable cache
+        
+        with open(yaml_path, 'rb') as file:
+            yaml_data = yaml.load(file, Loader=YamlSafeLoader)
+        
+        tmp_path = f"{YAML_PARSE_CACHE}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(MARINE_CACHE_DIR, exist_ok=True)
+            with open(tmp_path, 'w') as file:
+                json.dump({'source': source, 'data': yaml_data}, file)
+            os.replace(tmp_path, YAML_PARSE_CACHE)
+        except (OSError, TypeError, ValueError) as e:
+            log.debug(f"Could not write YAML cache {YAML_PARSE_CACHE}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+        
+        return yaml_data
+
+    def _index_yaml_data(self):
+        """
+        Resolve the YAML sections used by discovery and config generation once
+        
+        Hot paths (per-station probes) read these attributes directly instead
+        of walking self.yaml_data with chained .get() calls.
+        """
+        self.api_modules = self.yaml_data.get('api_modules', {})
+        self.coops_config = self.api_modules.get('coops_module', {})
+        self.ndbc_config = self.api_modules.get('ndbc_module', {})
+        
+        # Inverted index of field definitions: {api_module: [(field_name, field_config), ...]}
+        # plus each field's runtime mapping with YAML defaults already applied
+        self.fields_by_module = {}
+        self.field_mappings = {}
+        for field_name, field_config in self.yaml_data.get('fields', {}).items():
+            api_module = field_config.get('api_module', 'unknown_module')
+            self.fields_by_module.setdefault(api_module, []).append((field_name, field_config))
+            self.field_mappings[field_name] = {
+                'database_field': field_config.get('database_field', field_name),
+                'database_type': field_config.get('database_type', 'REAL'),
+                'database_table': field_config.get('database_table', 'archive'),
+                'api_path': field_config.get('api_path', ''),
+                'unit_group': field_config.get('unit_group', 'group_count'),
+                'api_product': field_config.get('api_product', ''),
+                'description': field_config.get('description', '')
+            }
+
     def run_interactive_setup(self):
         """
         PRESERVE: Existing interactive setup flow with YAML-driven patterns
@@ -452,11 +545,7 @@ class MarineDataConfigurator:
             log.debug(f"Discovering CO-OPS stations for lat={latitude}, lon={longitude}, radius={radius_miles} miles")
             
             # Get API URLs from YAML configuration (DATA-DRIVEN)
-            api_modules = self.yaml_data.get('api_modules', {})
-            coops_config = api_modules.get('coops_module', {})
-            
-            stations_url = coops_config.get('metadata_url', '')
-            products_url_template = coops_config.get('products_url', '')
+            stations_url = self.coops_config.get('metadata_url', '')
             
             if not stations_url:
                 log.error("No CO-OPS metadata URL found in YAML")
@@ -471,7 +560,9 @@ class MarineDataConfigurator:
             
             # Discover ALL station types for comprehensive coverage
             station_types = ['tidepredictions', 'waterlevels', 'currents']
-            all_discovered_stations = []
+            # Keyed by station id: same station may appear in multiple types
+            all_discovered_stations = {}
+            station_coords = []  # (lat, lon) per station, in insertion order
             
             for station_type in station_types:
                 try:
@@ -480,42 +571,41 @@ class MarineDataConfigurator:
                         'type': station_type,
                         'expand': 'details'
                     }
-                    url_params = urllib.parse.urlencode(params)
-                    full_url = f"{stations_url}?{url_params}"
                     
                     log.debug(f"Fetching {station_type} stations from API...")
                     
-                    response = urllib.request.urlopen(full_url, timeout=30)
-                    data = json.loads(response.read().decode('utf-8'))
-                    
-                    stations_list = data.get('stations', [])
-                    log.debug(f"Found {len(stations_list)} {station_type} stations")
-                    
-                    # Filter stations within bounding box (PRESERVE ALL EXISTING LOGIC)
-                    for station_data in stations_list:
-                        try:
-                            station_lat = float(station_data.get('lat', 0))
-                            station_lon = float(station_data.get('lng', 0))
-                            
-                            # Check if station is within bounding box
-                            if (lat_coords[0] <= station_lat <= lat_coords[1] and 
-                                lon_coords[0] <= station_lon <= lon_coords[1]):
-                                
-                                # Calculate distance for sorting
-                                distance = self._calculate_distance(latitude, longitude, station_lat, station_lon)
-                                
-                                # Preserve all station data and add metadata
-                                station_record = dict(station_data)
-                                station_record['distance'] = distance
-                                station_record['station_type'] = station_type
-                                
-                                # Avoid duplicates (same station may appear in multiple types)
-                                station_id = station_record.get('id')
-                                if not any(s.get('id') == station_id for s in all_discovered_stations):
-                                    all_discovered_stations.append(station_record)
+                    # Stream the station list; records are filtered as they arrive
+                    station_count = 0
+                    with self.session.get(stations_url, params=params, stream=True, timeout=30) as response:
+                        response.raise_for_status()
+                        
+                        # Filter stations within bounding box (PRESERVE ALL EXISTING LOGIC)
+                        for station_data in self._iter_coops_stations(response):
+                            station_count += 1
+                            try:
+                                station_lat = float(station_data.get('lat', 0))
+                                station_lon = float(station_data.get('lng', 0))
                                 
-                        except (ValueError, TypeError):
-                            continue
+                                # Check if station is within bounding box
+                                if (lat_coords[0] <= station_lat <= lat_coords[1] and 
+                                    lon_coords[0] <= station_lon <= lon_coords[1]):
+                                    
+                                    # Avoid duplicates (first station type seen wins)
+                                    station_id = station_data.get('id')
+                                    if station_id in all_discovered_stations:
+                                        continue
+                                    
+                                    # Keep only the station data the installer uses and add metadata
+                                    station_record = {key: station_data[key] for key in COOPS_STATION_KEYS
+                                                      if key in station_data}
+                                    station_record['station_type'] = station_type
+                                    all_discovered_stations[station_id] = station_record
+                                    station_coords.append((station_lat, station_lon))
+                                    
+                            except (ValueError, TypeError):
+                                continue
+                    
+                    log.debug(f"Found {station_count} {station_type} stations")
                             
                 except Exception as e:
                     log.debug(f"Error fetching {station_type} stations: {e}")
@@ -523,116 +613,126 @@ class MarineDataConfigurator:
             
             log.debug(f"Found {len(all_discovered_stations)} unique stations within bounding box")
             
+            # Distances for all candidates in one batch
+            distances = self._calculate_distances(latitude, longitude, station_coords)
+            for station_record, distance in zip(all_discovered_stations.values(), distances):
+                station_record['distance'] = distance
+            
             # Sort by distance and take closest stations
-            all_discovered_stations.sort(key=lambda x: x['distance'])
-            closest_stations = all_discovered_stations[:15]
+            closest_stations = heapq.nsmallest(15, all_discovered_stations.values(), key=lambda x: x['distance'])
             
             log.debug(f"Using {len(closest_stations)} closest stations")
             for i, station in enumerate(closest_stations[:5]):
                 log.debug(f"  {i+1}. {station.get('name')} - {station.get('distance', 0):.1f} miles ({station.get('station_type')})")
             
-            # PRESERVE: Get capabilities for each station (existing capability detection)
-            final_stations = []
-            for station in closest_stations:
-                station_id = station.get('id')
-                
-                if products_url_template and station_id:
-                    # Use existing capability detection with retry logic (PRESERVE ALL LOGIC)
-                    capabilities = []
-                    for attempt in range(2):
-                        try:
-                            products_url = products_url_template.format(station_id=station_id)
-                            products_response = urllib.request.urlopen(products_url, timeout=10)
-                            products_data = json.loads(products_response.read().decode('utf-8'))
-                            
-                            # Get capability mapping from YAML (DATA-DRIVEN)
-                            capability_mapping = coops_config.get('product_capability_mapping', {})
-                            
-                            # Extract capabilities using YAML mapping
-                            products_list = products_data.get('products', [])
-                            
-                            for product in products_list:
-                                product_name = product.get('name', '')
-                                
-                                # Use YAML capability mapping
-                                for capability, keywords in capability_mapping.items():
-                                    if any(keyword.lower() in product_name.lower() for keyword in keywords):
-                                        capabilities.append(capability)
-                            
-                            break  # Success
-                            
-                        except Exception as e:
-                            if attempt == 0:
-                                time.sleep(1)  # Wait and retry
-                            else:
-                                capabilities = ['tide_predictions']  # Default for all station types
-                    
-                    station['capabilities'] = list(set(capabilities)) if capabilities else ['tide_predictions']
-                else:
-                    station['capabilities'] = ['tide_predictions']  # Default capability
-                
-                final_stations.append(station)
-            
-            log.debug(f"Returning {len(final_stations)} stations with capabilities")
-            return final_stations
+            # Capabilities are resolved on demand in the selection screen
+            # (see _enhance_coops_stations_with_capabilities)
+            return closest_stations
             
         except Exception as e:
             log.error(f"Error in CO-OPS station discovery: {e}")
             return []
    
+    def _iter_coops_stations(self, response):
+        """
+        Yield station records from a streamed CO-OPS stations response one at a time
+        
+        Uses ijson (3.1+) when it is installed so the multi-megabyte payload is
+        never held in memory as a whole; otherwise falls back to response.json().
+        """
+        if ijson is None:
+            yield from response.json().get('stations', [])
+            return
+        
+        response.raw.decode_content = True  # Undo any gzip transfer encoding
+        yield from ijson.items(response.raw, 'stations.item', use_float=True)
+
     def _discover_ndbc_stations(self, latitude, longitude):
         """
         Discover NDBC stations within range, filtering by actual data capabilities
         """
         try:
             # Get NDBC metadata URL from YAML configuration
-            api_modules = self.yaml_data.get('api_modules', {})
-            ndbc_config = api_modules.get('ndbc_module', {})
-            metadata_url = ndbc_config.get('metadata_url', '')
-            response = urllib.request.urlopen(metadata_url, timeout=30)
-            content = response.read().decode('utf-8')
+            metadata_url = self.ndbc_config.get('metadata_url', '')
+            
+            # Bounding box around the 100 mile search radius (1 degree latitude ≈ 69 miles)
+            radius_miles = 100
+            dlat_max = radius_miles / 69.0
+            # Longitude span uses the box edge nearest the pole so it is never too narrow
+            dlon_max = radius_miles / (69.0 * max(0.01, math.cos(math.radians(min(90.0, abs(latitude) + dlat_max)))))
+            
+            # First pass: stream-parse the station XML as it downloads, keeping
+            # coordinates of stations inside the bounding box only
+            candidates = []
+            with self.session.get(metadata_url, stream=True, timeout=30) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True  # Undo any gzip transfer encoding
+                for _, station in ET.iterparse(response.raw):
+                    if station.tag != 'station':
+                        continue
+                    
+                    station_id = station.get('id')
+                    station_name = station.get('name', f'NDBC {station_id}')
+                    lat_text = station.get('lat', 0)
+                    lon_text = station.get('lon', 0)
+                    station.clear()  # Attributes copied; release the element's contents
+                    
+                    try:
+                        station_lat = float(lat_text)
+                        station_lon = float(lon_text)
+                    except (ValueError, TypeError):
+                        continue
+                    
+                    # Cheap rejection before any trig (longitude difference wrapped to ±180)
+                    if (abs(station_lat - latitude) > dlat_max or
+                            abs((station_lon - longitude + 180) % 360 - 180) > dlon_max):
+                        continue
+                    
+                    candidates.append((station_id, station_name, station_lat, station_lon))
             
-            # Parse XML to extract station info
-            import xml.etree.ElementTree as ET
-            root = ET.fromstring(content)
+            # Calculate all distances in one batch
+            distances = self._calculate_distances(
+                latitude, longitude, [(station_lat, station_lon) for _, _, station_lat, station_lon in candidates])
             
+            # Use same distance limit as CO-OPS method; nearest first so probing
+            # can stop as soon as enough useful stations have been found
+            in_range = sorted(((candidate, distance) for candidate, distance in zip(candidates, distances)
+                               if distance <= radius_miles), key=lambda item: item[1])
+            
+            # Test if stations have useful capabilities we want; each test is an
+            # independent HTTP fetch, so run them concurrently one batch at a time
             nearby_stations = []
-            for station in root.findall('.//station'):
-                try:
-                    station_id = station.get('id')
-                    station_name = station.get('name', f'NDBC {station_id}')
-                    station_lat = float(station.get('lat', 0))
-                    station_lon = float(station.get('lon', 0))
+            with ThreadPoolExecutor(max_workers=NDBC_PROBE_WORKERS) as executor:
+                for batch_start in range(0, len(in_range), NDBC_PROBE_WORKERS):
+                    if len(nearby_stations) >= 15:
+                        break
                     
-                    # Calculate distance first
-                    distance = self._calculate_distance(latitude, longitude, station_lat, station_lon)
+                    batch = in_range[batch_start:batch_start + NDBC_PROBE_WORKERS]
+                    all_capabilities = executor.map(self._test_ndbc_station_real_data,
+                                                    [candidate[0] for candidate, _ in batch])
                     
-                    if distance <= 100:  # Use same distance limit as CO-OPS method
-                        # Test if station has useful capabilities we want
-                        capabilities = self._test_ndbc_station_real_data(station_id)
-                        
-                        # Only include stations that have capabilities we're looking for
-                        useful_capabilities = ['Atmospheric Data', 'Wave Data', 'Ocean Temperature']
-                        if any(cap in capabilities for cap in useful_capabilities):
-                            # Calculate cardinal bearing
-                            bearing = self._calculate_bearing(latitude, longitude, station_lat, station_lon)
-                            cardinal = self._bearing_to_16_point_cardinal(bearing)
-                            
-                            nearby_stations.append({
-                                'id': station_id,
-                                'name': station_name,
-                                'lat': station_lat,
-                                'lon': station_lon,
-                                'distance': distance,
-                                'cardinal': cardinal,
-                                'capabilities': capabilities
-                            })
-                        
-                except (ValueError, TypeError, AttributeError):
-                    continue
+                    for ((station_id, station_name, station_lat, station_lon), distance), capabilities in zip(batch, all_capabilities):
+                        try:
+                            # Only include stations that have capabilities we're looking for
+                            if any(cap in capabilities for cap in NDBC_USEFUL_CAPABILITIES):
+                                # Calculate cardinal bearing
+                                bearing = self._calculate_bearing(latitude, longitude, station_lat, station_lon)
+                                cardinal = self._bearing_to_16_point_cardinal(bearing)
+                                
+                                nearby_stations.append({
+                                    'id': station_id,
+                                    'name': station_name,
+                                    'lat': station_lat,
+                                    'lon': station_lon,
+                                    'distance': distance,
+                                    'cardinal': cardinal,
+                                    'capabilities': capabilities
+                                })
+                                
+                        except (ValueError, TypeError, AttributeError):
+                            continue
             
-            # Sort by distance and return closest stations
-            nearby_stations.sort(key=lambda x: x['distance'])
+            # Stations were collected nearest first; return the closest
             log.debug(f"Found {len(nearby_stations)} NDBC stations within 100 miles")
             return nearby_stations[:15]
             
@@ -640,69 +740,34 @@ class MarineDataConfigurator:
             log.error(f"Error discovering NDBC stations: {e}")
             return []
     
-    def _calculate_distance(self, lat1, lon1, lat2, lon2):
+    def _calculate_distances(self, lat1, lon1, points):
         """
-        PRESERVE: Existing distance calculation using Haversine formula
-        """
-        # Convert to radians
-        lat1_rad = math.radians(lat1)
-        lon1_rad = math.radians(lon1)
-        lat2_rad = math.radians(lat2)
-        lon2_rad = math.radians(lon2)
-        
-        # Haversine formula
-        dlat = lat2_rad - lat1_rad
-        dlon = lon2_rad - lon1_rad
-        a = math.sin(dlat/2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon/2)**2
-        c = 2 * math.asin(math.sqrt(a))
-        distance_km = 6371 * c
-        distance_miles = distance_km * 0.621371
+        Haversine distance in miles from (lat1, lon1) to each (lat2, lon2) in points
         
-        return distance_miles
-
-    def _select_fields_from_yaml(self):
+        The origin's trig is computed once and the math functions are bound
+        locally, so large station lists avoid per-station call overhead.
         """
-        PRESERVE: Existing field selection using YAML structure
-        """
-        # PRESERVE: Use existing YAML field definitions
-        fields = self.yaml_data.get('fields', {})
-        
-        # PRESERVE: Use existing complexity level selection patterns
-        complexity_level = self._get_complexity_level()
-        
-        # PRESERVE: Filter fields based on complexity level and YAML patterns
-        selected_fields = {}
-        for field_name, field_config in fields.items():
-            complexity_levels = field_config.get('complexity_levels', ['all'])
-            if complexity_level in complexity_levels or 'all' in complexity_levels:
-                selected_fields[field_name] = True
-        
-        self.selected_fields = selected_fields
-
-    def _get_complexity_level(self):
-        """
-        PRESERVE: Existing complexity level selection
-        """
-        print("\nSelect data collection level:")
-        print("1. Minimal - Essential marine data only")
-        print("2. All - Complete marine data collection")
-        
-        try:
-            choice = input("Enter choice (1-2): ").strip()
-            if choice == '1':
-                return 'minimal'
-            else:
-                return 'all'
-        except:
-            return 'minimal'  # Default
+        radians, sin, cos, asin, sqrt = math.radians, math.sin, math.cos, math.asin, math.sqrt
+        lat1_rad = radians(lat1)
+        lon1_rad = radians(lon1)
+        cos_lat1 = cos(lat1_rad)
+        
+        distances = []
+        for lat2, lon2 in points:
+            lat2_rad = radians(lat2)
+            dlat = lat2_rad - lat1_rad
+            dlon = radians(lon2) - lon1_rad
+            a = sin(dlat/2)**2 + cos_lat1 * cos(lat2_rad) * sin(dlon/2)**2
+            distances.append(6371 * (2 * asin(sqrt(a))) * 0.621371)
+        
+        return distances
 
     def _get_update_interval(self, module_name):
         """
         PRESERVE: Get appropriate update interval for module (existing pattern)
         """
         # PRESERVE: Use existing interval patterns from YAML
-        api_modules = self.yaml_data.get('api_modules', {})
-        module_config = api_modules.get(module_name, {})
+        module_config = self.api_modules.get(module_name, {})
         return module_config.get('recommended_interval', 3600)
 
     def _interactive_station_selection_curses(self, coops_stations, ndbc_stations):
@@ -712,166 +777,262 @@ class MarineDataConfigurator:
         """
         selected_stations = {'coops_module': [], 'ndbc_module': []}
         
+        # Page 1: CO-OPS stations, Page 2: NDBC stations
+        pages = []
+        if coops_stations:
+            pages.append(('coops_module', self._station_page_screen(
+                coops_stations, "CO-OPS Tide Stations", self._get_coops_station_capabilities)))
+        if ndbc_stations:
+            pages.append(('ndbc_module', self._station_page_screen(ndbc_stations, "NDBC Marine Weather Buoys")))
+        
         try:
-            # Page 1: CO-OPS stations
-            if coops_stations:
-                selected_coops = self._curses_station_page(coops_stations, "CO-OPS Tide Stations")
-                selected_stations['coops_module'] = selected_coops
-            
-            # Page 2: NDBC stations  
-            if ndbc_stations:
-                selected_ndbc = self._curses_station_page(ndbc_stations, "NDBC Marine Weather Buoys")
-                selected_stations['ndbc_module'] = selected_ndbc
+            # Both pages share one curses session (single terminal init/teardown)
+            results = self._run_curses_session(*(screen for _, screen in pages))
+            for (module_name, _), selected_ids in zip(pages, results):
+                selected_stations[module_name] = selected_ids
                 
         except Exception as e:
             print(f"{CORE_ICONS['warning']} Error in station selection: {e}")
             # Fallback to first stations if curses fails
-            selected_stations['coops_module'] = coops_stations[:2] if coops_stations else []
-            selected_stations['ndbc_module'] = ndbc_stations[:1] if ndbc_stations else []
+            selected_stations['coops_module'] = [station['id'] for station in coops_stations[:2]]
+            selected_stations['ndbc_module'] = [station['id'] for station in ndbc_stations[:1]]
         
         return selected_stations
 
-    def _curses_station_page(self, stations, page_title):
+    def _run_curses_session(self, *screen_fns):
+        """
+        Run curses screens back to back inside a single curses.wrapper() session
+
+        Each screen_fn(stdscr) is called in order; returns a tuple of their results.
+        Raises RuntimeError without touching the terminal when stdin/stdout is not
+        a TTY, so callers drop straight to their non-interactive fallback.
+        """
+        def session(stdscr):
+            return tuple(screen_fn(stdscr) for screen_fn in screen_fns)
+        
+        if not screen_fns:
+            return ()
+        if not (sys.stdin.isatty() and sys.stdout.isatty()):
+            raise RuntimeError("interactive terminal required")
+        return curses.wrapper(session)
+
+    def _station_page_screen(self, stations, page_title, capability_loader=None):
         """
-        Curses interface with proper spacing, scrolling, and cardinal bearing display
+        Build curses screen with proper spacing, scrolling, and cardinal bearing display
+        
+        Stations whose 'capabilities' is None are resolved in the background with
+        capability_loader(station_id) when highlighted. Returns the screen
+        function; run it via _run_curses_session().
         """
         def station_selection_screen(stdscr):
             curses.curs_set(0)  # Hide cursor
             stdscr.clear()
             
-            selected_indices = set()
+            # Bind hot curses names to locals once (the draw loops below use them per row)
+            A_BOLD, A_DIM, A_NORMAL, A_REVERSE = curses.A_BOLD, curses.A_DIM, curses.A_NORMAL, curses.A_REVERSE
+            curses_error = curses.error
+            addstr = stdscr.addstr
+            
+            selected = [False] * len(stations)  # Selection flag per row
+            selected_count = 0
             current_row = 0
             scroll_offset = 0
             max_row = len(stations) - 1
+            dirty = True  # Repaint only when visible state changes
+            height, width = stdscr.getmaxyx()  # Re-read only on KEY_RESIZE
+            
+            # Station list is painted once into a pad; ncurses does the scrolling
+            # and clipping when the visible slice is copied to the screen
+            start_display_row = 5
+            lines_per_station = 3  # Station line + capabilities line + blank line
+            pad = None
+            loading = {}  # Row -> in-flight capability lookup thread
+            loaded = {}  # Row -> capabilities from a finished lookup; applied by this thread only
+            
+            # Station info text never changes while the page is up; format it once
+            labels = []
+            for station in stations:
+                # Station info line with cardinal bearing
+                distance = station.get('distance', 0)
+                cardinal = station.get('cardinal', '')  # Extract cardinal bearing
+                station_name = station.get('name', 'Unknown')
+                station_id = station.get('id', 'N/A')
+                state = station.get('state', '')
+                
+                # Include cardinal bearing in display when available
+                label = f"{station_name} ({station_id}) - {distance:.1f} mi"
+                if cardinal:
+                    label += f" {cardinal}"
+                if state:
+                    label += f" [{state}]"
+                labels.append(label)
+            
+            def request_capabilities(i):
+                """Start a one-shot background capability lookup for station i"""
+                station = stations[i]
+                if capability_loader is None or station.get('capabilities') is not None or i in loading:
+                    return
+                
+                def load():
+                    loaded[i] = capability_loader(station['id'])
+                
+                loading[i] = threading.Thread(target=load, daemon=True)
+                loading[i].start()
+            
+            def paint_station(i):
+                """Paint station i (info line + capabilities line) into the pad"""
+                station = stations[i]
+                
+                # Selection indicator + pre-formatted station info, clipped to width
+                station_line = station_lines[i][selected[i]]
+                
+                # Capabilities line (indented)
+                capabilities = station.get('capabilities', [])
+                if capabilities is None:
+                    cap_text = "    Capabilities: loading..." if i in loading else "    Capabilities: (highlight to check)"
+                elif capabilities:
+                    cap_text = "    Capabilities: " + ", ".join(capabilities)
+                else:
+                    cap_text = "    Capabilities: Unknown"
+                
+                # Highlight current row
+                attr = A_REVERSE if i == current_row else A_NORMAL
+                pad_row = i * lines_per_station
+                
+                try:
+                    pad.move(pad_row, 0)
+                    pad.clrtoeol()
+                    pad.addstr(pad_row, 0, station_line, attr)
+                    pad.move(pad_row + 1, 0)
+                    pad.clrtoeol()
+                    pad.addstr(pad_row + 1, 0, cap_text[:width-1], A_DIM)
+                except curses_error:
+                    pass  # Terminal narrower than the text
             
             while True:
-                stdscr.clear()
-                height, width = stdscr.getmaxyx()
+                if pad is None:
+                    # (Re)build the pad at the current terminal width
+                    pad = curses.newpad(len(stations) * lines_per_station + 1, max(width, 1))
+                    # (unselected, selected) station lines, clipped once per width
+                    station_lines = [(f"[ ] {label}"[:width-1], f"[X] {label}"[:width-1]) for label in labels]
+                    request_capabilities(current_row)
+                    for i in range(len(stations)):
+                        paint_station(i)
                 
-                # Header
-                header = f"{CORE_ICONS['navigation']} {page_title}"
-                stdscr.addstr(0, 0, header, curses.A_BOLD)
-                stdscr.addstr(1, 0, "=" * min(len(header), width-1))
+                if dirty:
+                    # erase() only blanks the buffer; curses then emits just the changed cells
+                    stdscr.erase()
                 
-                # Instructions
-                instructions = [
-                    "Use arrow keys to navigate, SPACE to select/deselect, ENTER to continue",
-                    "Select multiple stations for backup coverage during maintenance periods"
-                ]
+                    # Header
+                    header = f"{CORE_ICONS['navigation']} {page_title}"
+                    addstr(0, 0, header, A_BOLD)
+                    addstr(1, 0, "=" * min(len(header), width-1))
                 
-                for i, instruction in enumerate(instructions):
-                    if 2 + i < height - 1:
-                        stdscr.addstr(2 + i, 0, instruction[:width-1])
+                    # Instructions
+                    instructions = [
+                        "Use arrow keys to navigate, SPACE to select/deselect, ENTER to continue",
+                        "Select multiple stations for backup coverage during maintenance periods"
+                    ]
                 
-                # Calculate display area
-                start_display_row = 5
-                available_lines = height - start_display_row - 2  # Leave room for status
-                lines_per_station = 3  # Station line + capabilities line + blank line
-                stations_per_page = available_lines // lines_per_station
+                    for i, instruction in enumerate(instructions):
+                        if 2 + i < height - 1:
+                            addstr(2 + i, 0, instruction[:width-1])
                 
-                # Calculate scroll bounds
-                if current_row >= scroll_offset + stations_per_page:
-                    scroll_offset = current_row - stations_per_page + 1
-                elif current_row < scroll_offset:
-                    scroll_offset = current_row
-                    
-                scroll_offset = max(0, min(scroll_offset, len(stations) - stations_per_page))
+                    # Calculate display area
+                    available_lines = height - start_display_row - 2  # Leave room for status
+                    stations_per_page = max(1, available_lines // lines_per_station)
                 
-                # Display stations
-                display_row = start_display_row
-                for i in range(scroll_offset, min(scroll_offset + stations_per_page, len(stations))):
-                    if display_row >= height - 3:
-                        break
-                        
-                    station = stations[i]
-                    
-                    # Selection indicator
-                    checkbox = "[X]" if i in selected_indices else "[ ]"
-                    
-                    # Station info line with cardinal bearing
-                    distance = station.get('distance', 0)
-                    cardinal = station.get('cardinal', '')  # Extract cardinal bearing
-                    station_name = station.get('name', 'Unknown')
-                    station_id = station.get('id', 'N/A')
-                    state = station.get('state', '')
-                    
-                    # Include cardinal bearing in display when available
-                    if cardinal:
-                        station_line = f"{checkbox} {station_name} ({station_id}) - {distance:.1f} mi {cardinal}"
-                    else:
-                        station_line = f"{checkbox} {station_name} ({station_id}) - {distance:.1f} mi"
+                    # Calculate scroll bounds
+                    if current_row >= scroll_offset + stations_per_page:
+                        scroll_offset = current_row - stations_per_page + 1
+                    elif current_row < scroll_offset:
+                        scroll_offset = current_row
                     
-                    if state:
-                        station_line += f" [{state}]"
-                    
-                    # Highlight current row
-                    attr = curses.A_REVERSE if i == current_row else curses.A_NORMAL
-                    
-                    try:
-                        stdscr.addstr(display_row, 0, station_line[:width-1], attr)
-                        
-                        # Capabilities line (indented)
-                        capabilities = station.get('capabilities', [])
-                        if capabilities:
-                            cap_text = "    Capabilities: " + ", ".join(capabilities)
-                        else:
-                            cap_text = "    Capabilities: Unknown"
-                        
-                        stdscr.addstr(display_row + 1, 0, cap_text[:width-1], curses.A_DIM)
-                        
-                        # Blank line for spacing
-                        display_row += 3
-                        
-                    except curses.error:
-                        break  # Screen boundary reached
+                    scroll_offset = max(0, min(scroll_offset, len(stations) - stations_per_page))
                 
-                # Scroll indicators
-                if scroll_offset > 0:
-                    try:
-                        stdscr.addstr(start_display_row - 1, width - 10, "↑ More ↑", curses.A_BOLD)
-                    except curses.error:
-                        pass
+                    # Scroll indicators
+                    if scroll_offset > 0:
+                        try:
+                            addstr(start_display_row - 1, width - 10, "↑ More ↑", A_BOLD)
+                        except curses_error:
+                            pass
                         
-                if scroll_offset + stations_per_page < len(stations):
+                    if scroll_offset + stations_per_page < len(stations):
+                        try:
+                            addstr(height - 3, width - 10, "↓ More ↓", A_BOLD)
+                        except curses_error:
+                            pass
+                
+                    # Status line
+                    status = f"Selected: {selected_count} | Station {current_row + 1}/{len(stations)} | ENTER to continue"
                     try:
-                        stdscr.addstr(height - 3, width - 10, "↓ More ↓", curses.A_BOLD)
-                    except curses.error:
+                        addstr(height-1, 0, status[:width-1], A_BOLD)
+                    except curses_error:
                         pass
                 
-                # Status line
-                status = f"Selected: {len(selected_indices)} | Station {current_row + 1}/{len(stations)} | ENTER to continue"
-                try:
-                    stdscr.addstr(height-1, 0, status[:width-1], curses.A_BOLD)
-                except curses.error:
-                    pass
-                
-                stdscr.refresh()
+                    # Stage stdscr and the visible pad slice, then emit one update
+                    stdscr.noutrefresh()
+                    try:
+                        pad.noutrefresh(scroll_offset * lines_per_station, 0,
+                                        start_display_row, 0, height - 4, width - 1)
+                    except curses_error:
+                        pass  # Terminal too small to show the list
+                    curses.doupdate()
+                    dirty = False
                 
-                # Handle input
+                # Handle input; getch() only times out while lookups are in flight
+                stdscr.timeout(100 if loading else -1)
                 key = stdscr.getch()
                 
+                # Apply and repaint rows whose capability lookup has finished
+                for i in [i for i, thread in loading.items() if not thread.is_alive()]:
+                    del loading[i]
+                    if i in loaded:
+                        stations[i]['capabilities'] = loaded.pop(i)
+                    paint_station(i)
+                    dirty = True
+                
                 if key == curses.KEY_UP and current_row > 0:
                     current_row -= 1
+                    request_capabilities(current_row)
+                    # Only the two rows whose highlight changed are repainted
+                    paint_station(current_row + 1)
+                    paint_station(current_row)
+                    dirty = True
                 elif key == curses.KEY_DOWN and current_row < max_row:
                     current_row += 1
-                elif key == ord(' '):  # Spacebar to select/deselect
-                    if current_row in selected_indices:
-                        selected_indices.remove(current_row)
-                    else:
-                        selected_indices.add(current_row)
+                    request_capabilities(current_row)
+                    paint_station(current_row - 1)
+                    paint_station(current_row)
+                    dirty = True
+                elif key == ord(' ') and selected:  # Spacebar to select/deselect (ignored on an empty list)
+                    selected[current_row] = not selected[current_row]
+                    selected_count += 1 if selected[current_row] else -1
+                    paint_station(current_row)
+                    dirty = True
+                elif key == curses.KEY_RESIZE:
+                    height, width = stdscr.getmaxyx()
+                    pad = None  # Rebuild at the new width
+                    stdscr.clear()  # Full repaint after resize only
+                    dirty = True
                 elif key == ord('\n') or key == curses.KEY_ENTER or key == 10:  # Enter to continue
                     break
                 elif key == ord('q') or key == ord('Q'):  # Quit
                     return []
             
+            # Wait (bounded) for lookups still in flight so their stations are not
+            # fetched again; a lookup that outlives the wait is abandoned and never
+            # touches the station records
+            deadline = time.time() + COOPS_CAPABILITY_TIMEOUT + COOPS_CAPABILITY_JOIN_MARGIN
+            for i, thread in loading.items():
+                thread.join(max(0, deadline - time.time()))
+                if i in loaded:
+                    stations[i]['capabilities'] = loaded.pop(i)
+            
             # Return selected stations
-            return [stations[i].get('id', str(stations[i])) for i in selected_indices]
+            return [station.get('id', str(station)) for station, is_selected in zip(stations, selected) if is_selected]
         
-        try:
-            return curses.wrapper(station_selection_screen)
-        except Exception as e:
-            print(f"{CORE_ICONS['warning']} Curses interface error: {e}")
-            return stations[:2]  # Fallback selection
+        return station_selection_screen
 
     def _format_station_capabilities(self, capabilities):
         """
@@ -898,40 +1059,48 @@ class MarineDataConfigurator:
 
     def _enhance_coops_stations_with_capabilities(self, stations):
         """
-        Add capabilities to CO-OPS stations and include cardinal bearings
+        Add cardinal bearings to CO-OPS stations and mark capabilities unresolved
+
+        Station records are private copies built by _discover_coops_stations(),
+        so they are enhanced in place rather than copied again. Capabilities
+        are left as None and looked up only for stations the user highlights
+        (see _station_page_screen) or selects (see _resolve_coops_capabilities).
         """
-        enhanced_stations = []
-        
         for station in stations:
-            enhanced_station = station.copy()
-            
             # Calculate cardinal bearing for CO-OPS stations
             station_lat = float(station.get('lat', 0))
             station_lon = float(station.get('lng', 0))
             bearing = self._calculate_bearing(self.user_latitude, self.user_longitude, station_lat, station_lon)
-            cardinal = self._bearing_to_16_point_cardinal(bearing)
-            enhanced_station['cardinal'] = cardinal
-            
-            # Get station capabilities from existing method (preserve existing logic)
-            capabilities = self._get_coops_station_capabilities(station['id'])
-            enhanced_station['capabilities'] = capabilities
-            
-            enhanced_stations.append(enhanced_station)
+            station['cardinal'] = self._bearing_to_16_point_cardinal(bearing)
+            station['capabilities'] = None  # Resolved on demand
         
-        return enhanced_stations
+        return stations
+
+    def _resolve_coops_capabilities(self, stations):
+        """
+        Look up capabilities for CO-OPS stations that have not been resolved yet
+        """
+        for station in stations:
+            if station.get('capabilities') is None:
+                station['capabilities'] = self._get_coops_station_capabilities(station['id'])
 
     def _get_coops_station_capabilities(self, station_id):
         """
         NEW METHOD: Detect CO-OPS station capabilities via API
         """
+        cached = self._get_cached_coops_capabilities(station_id)
+        if cached is not None:
+            return cached
+        
         capabilities = []
         
         try:
             # Check station products API
             products_url = f"https://api.tidesandcurrents.noaa.gov/mdapi/prod/webapi/stations/{station_id}/products.json"
             
-            response = urllib.request.urlopen(products_url, timeout=10)
-            data = json.loads(response.read().decode('utf-8'))
+            response = self.session.get(products_url, timeout=COOPS_CAPABILITY_TIMEOUT)
+            response.raise_for_status()
+            data = response.json()
             
             products = data.get('products', [])
             
@@ -952,6 +1121,7 @@ class MarineDataConfigurator:
             
             # Remove duplicates
             capabilities = list(set(capabilities))
+            self._store_cached_coops_capabilities(station_id, capabilities)
             
         except Exception as e:
             # Default capabilities if API fails
@@ -959,238 +1129,273 @@ class MarineDataConfigurator:
         
         return capabilities
 
-    def _interactive_field_selection_curses(self, available_fields):
+    def _get_cached_coops_capabilities(self, station_id):
+        """
+        Return cached capabilities for a CO-OPS station, or None if absent or expired
+        """
+        with self.capability_cache_lock:
+            if self.capability_cache is None:
+                try:
+                    with open(COOPS_CAPABILITY_CACHE, 'r') as file:
+                        self.capability_cache = json.load(file)
+                except (OSError, ValueError):
+                    self.capability_cache = {}
+                if not isinstance(self.capability_cache, dict):
+                    self.capability_cache = {}
+            entry = self.capability_cache.get(str(station_id))
+        
+        try:
+            if time.time() - entry['timestamp'] < COOPS_CAPABILITY_CACHE_TTL:
+                return entry['capabilities']
+        except (TypeError, KeyError):
+            pass  # No entry or malformed entry
+        return None
+
+    def _store_cached_coops_capabilities(self, station_id, capabilities):
+        """
+        Record capabilities fetched from the API and rewrite the cache file atomically,
+        pruning entries older than COOPS_CAPABILITY_CACHE_TTL
+        """
+        with self.capability_cache_lock:
+            if self.capability_cache is None:
+                self.capability_cache = {}
+            now = int(time.time())
+            
+            # Drop expired (or malformed) entries so the file does not grow across runs
+            for cached_id, entry in list(self.capability_cache.items()):
+                try:
+                    if now - entry['timestamp'] < COOPS_CAPABILITY_CACHE_TTL:
+                        continue
+                except (TypeError, KeyError):
+                    pass
+                del self.capability_cache[cached_id]
+            
+            self.capability_cache[str(station_id)] = {
+                'capabilities': capabilities,
+                'timestamp': now
+            }
+            
+            tmp_path = f"{COOPS_CAPABILITY_CACHE}.{os.getpid()}.tmp"
+            try:
+                os.makedirs(MARINE_CACHE_DIR, exist_ok=True)
+                with open(tmp_path, 'w') as file:
+                    json.dump(self.capability_cache, file)
+                os.replace(tmp_path, COOPS_CAPABILITY_CACHE)
+            except OSError as e:
+                log.debug(f"Could not write capability cache {COOPS_CAPABILITY_CACHE}: {e}")
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+    def _interactive_field_selection_curses(self, fields_by_module):
         """
         IMPROVED: Curses interface with proper spacing, headers, and scrolling
+        
+        fields_by_module is the {api_module: [(field_name, field_config), ...]}
+        index built by _index_yaml_data().
         """
         def field_selection_screen(stdscr):
             curses.curs_set(0)
+            stdscr.timeout(-1)  # Blocking getch(): no polling while idle
             stdscr.clear()
             
+            # Bind hot curses names to locals once (the draw loops below use them per row)
+            A_BOLD, A_DIM, A_NORMAL, A_REVERSE = curses.A_BOLD, curses.A_DIM, curses.A_NORMAL, curses.A_REVERSE
+            curses_error = curses.error
+            addstr = stdscr.addstr
+            
             # Organize fields by module
             coops_fields = []
             ndbc_fields = []
             
-            for field_name, field_config in available_fields.items():
-                api_module = field_config.get('api_module', '')
-                field_display = {
-                    'name': field_name,
-                    'display_name': field_config.get('display_name', field_name),
-                    'description': field_config.get('description', ''),
-                    'config': field_config
-                }
-                
+            # Display text never changes while the screen is up; format it once
+            for api_module, module_fields in fields_by_module.items():
                 if 'coops' in api_module:
-                    coops_fields.append(field_display)
+                    section_fields = coops_fields
                 elif 'ndbc' in api_module:
-                    ndbc_fields.append(field_display)
+                    section_fields = ndbc_fields
+                else:
+                    continue
+                
+                for field_name, field_config in module_fields:
+                    description = field_config.get('description', '')
+                    section_fields.append(FieldRow(
+                        field_name,
+                        f" {field_config.get('display_name', field_name)}",
+                        f"      → {description}" if description else ''
+                    ))
             
             all_fields = coops_fields + ndbc_fields
-            selected_indices = set(range(len(all_fields)))  # Start with all selected
+            sections = (("CO-OPS (Tides & Water Levels):", coops_fields),
+                        ("NDBC (Marine Weather):", ndbc_fields))
+            selected = [True] * len(all_fields)  # Start with all selected
+            selected_count = len(all_fields)
             current_row = 0
             max_row = len(all_fields) - 1
             scroll_offset = 0
+            dirty = True  # Repaint only when visible state changes
+            height, width = stdscr.getmaxyx()  # Re-read only on KEY_RESIZE
+            
+            def clip_lines():
+                """Clip row text to the terminal width; redone only when the width changes"""
+                limit = width - 1
+                # (unselected, selected) variants, indexed by the row's selection flag
+                field_lines = [(f"  [ ]{field.label}"[:limit], f"  [X]{field.label}"[:limit]) for field in all_fields]
+                desc_lines = [field.desc_line[:limit] for field in all_fields]
+                return field_lines, desc_lines
+            
+            # Layout is fixed: precompute each field's line offset in the scrollable list
+            lines_per_field = 3  # Field line + description line + blank line
+            lines_per_section_header = 2  # Header line + separator line
+            section_header_offsets = []
+            field_line_offsets = []
+            total_lines_needed = 0
+            for section_title, section_fields in sections:
+                if section_fields:
+                    section_header_offsets.append((total_lines_needed, section_title))
+                    total_lines_needed += lines_per_section_header
+                    for _ in section_fields:
+                        field_line_offsets.append(total_lines_needed)
+                        total_lines_needed += lines_per_field
+            
+            # Field list is painted once into a pad; ncurses does the scrolling
+            # and clipping when the visible slice is copied to the screen
+            start_display_row = 5
+            pad = None
+            
+            def paint_field(index):
+                """Paint field index (name line + description line) into the pad"""
+                pad_row = field_line_offsets[index]
+                attr = A_REVERSE if index == current_row else A_NORMAL
+                try:
+                    pad.move(pad_row, 0)
+                    pad.clrtoeol()
+                    pad.addstr(pad_row, 0, field_lines[index][selected[index]], attr)
+                    if desc_lines[index]:
+                        pad.addstr(pad_row + 1, 0, desc_lines[index], A_DIM)
+                except curses_error:
+                    pass  # Terminal narrower than the text
             
             while True:
-                stdscr.clear()
-                height, width = stdscr.getmaxyx()
-                
-                # Header
-                header = f"{CORE_ICONS['selection']} Marine Data Field Selection"
-                stdscr.addstr(0, 0, header, curses.A_BOLD)
-                stdscr.addstr(1, 0, "=" * min(len(header), width-1))
+                if pad is None:
+                    # (Re)build the pad at the current terminal width
+                    pad = curses.newpad(total_lines_needed + 1, max(width, 1))
+                    field_lines, desc_lines = clip_lines()
+                    for pad_row, section_title in section_header_offsets:
+                        try:
+                            pad.addstr(pad_row, 0, section_title[:width-1], A_BOLD)
+                            pad.addstr(pad_row + 1, 0, ("─" * 30)[:width-1], A_BOLD)
+                        except curses_error:
+                            pass
+                    for index in range(len(all_fields)):
+                        paint_field(index)
                 
-                # Instructions
-                instructions = [
-                    "Use arrow keys to navigate, SPACE to select/deselect, ENTER to continue",
-                    "All fields selected by default - deselect unwanted fields"
-                ]
+                if dirty:
+                    # erase() only blanks the buffer; curses then emits just the changed cells
+                    stdscr.erase()
                 
-                for i, instruction in enumerate(instructions):
-                    if 2 + i < height - 1:
-                        stdscr.addstr(2 + i, 0, instruction[:width-1])
+                    # Header
+                    header = f"{CORE_ICONS['selection']} Marine Data Field Selection"
+                    addstr(0, 0, header, A_BOLD)
+                    addstr(1, 0, "=" * min(len(header), width-1))
                 
-                # Calculate display area
-                start_display_row = 5
-                available_lines = height - start_display_row - 2  # Leave room for status
-                lines_per_field = 3  # Field line + description line + blank line
-                lines_per_section_header = 2  # Header line + separator line
+                    # Instructions
+                    instructions = [
+                        "Use arrow keys to navigate, SPACE to select/deselect, ENTER to continue",
+                        "All fields selected by default - deselect unwanted fields"
+                    ]
                 
-                # Calculate total display lines needed
-                total_lines_needed = 0
-                if coops_fields:
-                    total_lines_needed += lines_per_section_header + (len(coops_fields) * lines_per_field)
-                if ndbc_fields:
-                    total_lines_needed += lines_per_section_header + (len(ndbc_fields) * lines_per_field)
+                    for i, instruction in enumerate(instructions):
+                        if 2 + i < height - 1:
+                            addstr(2 + i, 0, instruction[:width-1])
                 
-                # Calculate scrolling
-                max_scroll = max(0, total_lines_needed - available_lines)
+                    # Calculate display area (pad rows start_display_row..height-4)
+                    available_lines = height - start_display_row - 3  # Leave room for indicator + status
                 
-                # Adjust scroll based on current field position
-                current_field_line = 0
-                if coops_fields:
-                    current_field_line += lines_per_section_header
-                    if current_row < len(coops_fields):
-                        current_field_line += current_row * lines_per_field
-                    else:
-                        current_field_line += len(coops_fields) * lines_per_field
-                        if ndbc_fields:
-                            current_field_line += lines_per_section_header
-                            current_field_line += (current_row - len(coops_fields)) * lines_per_field
+                    # Calculate scrolling
+                    max_scroll = max(0, total_lines_needed - available_lines)
                 
-                # Auto-scroll to keep current field visible
-                if current_field_line - scroll_offset >= available_lines - 3:
-                    scroll_offset = current_field_line - available_lines + 6
-                elif current_field_line < scroll_offset:
-                    scroll_offset = max(0, current_field_line - 3)
+                    # Adjust scroll based on current field position
+                    current_field_line = field_line_offsets[current_row] if field_line_offsets else 0
                 
-                scroll_offset = max(0, min(scroll_offset, max_scroll))
+                    # Auto-scroll to keep current field visible
+                    if current_field_line - scroll_offset >= available_lines - 3:
+                        scroll_offset = current_field_line - available_lines + 6
+                    elif current_field_line < scroll_offset:
+                        scroll_offset = max(0, current_field_line - 3)
                 
-                # Display content with scrolling
-                display_row = start_display_row
-                current_line = 0
-                current_field_index = 0
+                    scroll_offset = max(0, min(scroll_offset, max_scroll))
                 
-                # CO-OPS Section
-                if coops_fields:
-                    # Section header
-                    if current_line >= scroll_offset and display_row < height - 2:
+                    # Scroll indicators
+                    if scroll_offset > 0:
                         try:
-                            stdscr.addstr(display_row, 0, "CO-OPS (Tides & Water Levels):", curses.A_BOLD)
-                            display_row += 1
-                            stdscr.addstr(display_row, 0, "─" * 30, curses.A_BOLD)
-                            display_row += 1
-                        except curses.error:
+                            addstr(start_display_row - 1, width - 10, "↑ More ↑", A_BOLD)
+                        except curses_error:
                             pass
-                    current_line += lines_per_section_header
-                    
-                    # CO-OPS fields
-                    for field in coops_fields:
-                        if current_line >= scroll_offset and display_row < height - 2:
-                            # Selection indicator and field name
-                            checkbox = "[X]" if current_field_index in selected_indices else "[ ]"
-                            field_line = f"  {checkbox} {field['display_name']}"
-                            
-                            # Highlight current row
-                            attr = curses.A_REVERSE if current_field_index == current_row else curses.A_NORMAL
-                            
-                            try:
-                                stdscr.addstr(display_row, 0, field_line[:width-1], attr)
-                                display_row += 1
-                                
-                                # Description line with arrow
-                                if field['description'] and display_row < height - 2:
-                                    desc_line = f"      → {field['description']}"
-                                    stdscr.addstr(display_row, 0, desc_line[:width-1], curses.A_DIM)
-                                    display_row += 1
-                                
-                                # Blank line for spacing
-                                if display_row < height - 2:
-                                    display_row += 1
-                                    
-                            except curses.error:
-                                break
-                        
-                        current_line += lines_per_field
-                        current_field_index += 1
                 
-                # NDBC Section
-                if ndbc_fields:
-                    # Section header
-                    if current_line >= scroll_offset and display_row < height - 2:
+                    if scroll_offset < max_scroll:
                         try:
-                            stdscr.addstr(display_row, 0, "NDBC (Marine Weather):", curses.A_BOLD)
-                            display_row += 1
-                            stdscr.addstr(display_row, 0, "─" * 30, curses.A_BOLD)
-                            display_row += 1
-                        except curses.error:
+                            addstr(height - 3, width - 10, "↓ More ↓", A_BOLD)
+                        except curses_error:
                             pass
-                    current_line += lines_per_section_header
-                    
-                    # NDBC fields
-                    for field in ndbc_fields:
-                        if current_line >= scroll_offset and display_row < height - 2:
-                            # Selection indicator and field name
-                            checkbox = "[X]" if current_field_index in selected_indices else "[ ]"
-                            field_line = f"  {checkbox} {field['display_name']}"
-                            
-                            # Highlight current row
-                            attr = curses.A_REVERSE if current_field_index == current_row else curses.A_NORMAL
-                            
-                            try:
-                                stdscr.addstr(display_row, 0, field_line[:width-1], attr)
-                                display_row += 1
-                                
-                                # Description line with arrow
-                                if field['description'] and display_row < height - 2:
-                                    desc_line = f"      → {field['description']}"
-                                    stdscr.addstr(display_row, 0, desc_line[:width-1], curses.A_DIM)
-                                    display_row += 1
-                                
-                                # Blank line for spacing
-                                if display_row < height - 2:
-                                    display_row += 1
-                                    
-                            except curses.error:
-                                break
-                        
-                        current_line += lines_per_field
-                        current_field_index += 1
                 
-                # Scroll indicators
-                if scroll_offset > 0:
+                    # Status line
+                    status = f"Selected: {selected_count}/{len(all_fields)} fields | Field {current_row + 1}/{len(all_fields)} | ENTER to continue"
                     try:
-                        stdscr.addstr(start_display_row - 1, width - 10, "↑ More ↑", curses.A_BOLD)
-                    except curses.error:
+                        addstr(height-1, 0, status[:width-1], A_BOLD)
+                    except curses_error:
                         pass
                 
-                if scroll_offset < max_scroll:
+                    # Stage stdscr and the visible pad slice, then emit one update
+                    stdscr.noutrefresh()
                     try:
-                        stdscr.addstr(height - 3, width - 10, "↓ More ↓", curses.A_BOLD)
-                    except curses.error:
-                        pass
-                
-                # Status line
-                status = f"Selected: {len(selected_indices)}/{len(all_fields)} fields | Field {current_row + 1}/{len(all_fields)} | ENTER to continue"
-                try:
-                    stdscr.addstr(height-1, 0, status[:width-1], curses.A_BOLD)
-                except curses.error:
-                    pass
-                
-                stdscr.refresh()
+                        pad.noutrefresh(scroll_offset, 0, start_display_row, 0, height - 4, width - 1)
+                    except curses_error:
+                        pass  # Terminal too small to show the list
+                    curses.doupdate()
+                    dirty = False
                 
                 # Handle input
                 key = stdscr.getch()
                 
                 if key == curses.KEY_UP and current_row > 0:
                     current_row -= 1
+                    # Only the two rows whose highlight changed are repainted
+                    paint_field(current_row + 1)
+                    paint_field(current_row)
+                    dirty = True
                 elif key == curses.KEY_DOWN and current_row < max_row:
                     current_row += 1
-                elif key == ord(' '):  # Spacebar to select/deselect
-                    if current_row in selected_indices:
-                        selected_indices.remove(current_row)
-                    else:
-                        selected_indices.add(current_row)
+                    paint_field(current_row - 1)
+                    paint_field(current_row)
+                    dirty = True
+                elif key == ord(' ') and selected:  # Spacebar to select/deselect (ignored on an empty list)
+                    selected[current_row] = not selected[current_row]
+                    selected_count += 1 if selected[current_row] else -1
+                    paint_field(current_row)
+                    dirty = True
+                elif key == curses.KEY_RESIZE:
+                    height, width = stdscr.getmaxyx()
+                    pad = None  # Rebuild (and re-clip text) at the new width
+                    stdscr.clear()  # Full repaint after resize only
+                    dirty = True
                 elif key == ord('\n') or key == curses.KEY_ENTER or key == 10:  # Enter to continue
                     break
                 elif key == ord('q') or key == ord('Q'):  # Quit
                     return {}
             
             # Return selected fields
-            selected_fields = {}
-            for i in selected_indices:
-                if i < len(all_fields):
-                    field_name = all_fields[i]['name']
-                    selected_fields[field_name] = True
-            
-            return selected_fields
+            return {field.name: True for field, is_selected in zip(all_fields, selected) if is_selected}
         
         try:
-            return curses.wrapper(field_selection_screen)
+            return self._run_curses_session(field_selection_screen)[0]
         except Exception as e:
             print(f"{CORE_ICONS['warning']} Field selection error: {e}")
             # Fallback to all fields
-            return {name: True for name in available_fields.keys()}
+            return {field_name: True
+                    for module_fields in fields_by_module.values()
+                    for field_name, _ in module_fields}
 
     def _discover_and_select_stations(self):
         """
@@ -1239,21 +1444,19 @@ class MarineDataConfigurator:
             self.selected_stations = selected_stations
             
             # MARK SELECTED STATIONS IN ENHANCED LISTS
-            # Mark selected CO-OPS stations
-            selected_coops_ids = selected_stations.get('coops_module', [])
+            # Mark selected CO-OPS stations (set: O(1) membership per station)
+            selected_coops_ids = set(selected_stations.get('coops_module', []))
             for station in self.enhanced_coops_stations:
-                if station.get('id') in selected_coops_ids:
-                    station['selected'] = True
-                else:
-                    station['selected'] = False
+                station['selected'] = station.get('id') in selected_coops_ids
+            
+            # Capabilities are only needed (for station metadata) on selected stations
+            self._resolve_coops_capabilities(
+                [station for station in self.enhanced_coops_stations if station['selected']])
             
             # Mark selected NDBC stations
-            selected_ndbc_ids = selected_stations.get('ndbc_module', [])
+            selected_ndbc_ids = set(selected_stations.get('ndbc_module', []))
             for station in self.enhanced_ndbc_stations:
-                if station.get('id') in selected_ndbc_ids:
-                    station['selected'] = True
-                else:
-                    station['selected'] = False
+                station['selected'] = station.get('id') in selected_ndbc_ids
             
             return True
             
@@ -1265,11 +1468,8 @@ class MarineDataConfigurator:
         """
         MODIFIED: Add curses interface call to existing method
         """
-        # Get available fields from YAML (existing code unchanged)
-        fields = self.yaml_data.get('fields', {})
-        
-        # NEW: Use curses interface for selection
-        selected_fields = self._interactive_field_selection_curses(fields)
+        # NEW: Use curses interface for selection (fields from YAML, grouped by module)
+        selected_fields = self._interactive_field_selection_curses(self.fields_by_module)
         self.selected_fields = selected_fields
 
     def _generate_configuration_from_yaml(self):
@@ -1282,6 +1482,9 @@ class MarineDataConfigurator:
         - Field mapping (database_field)
         - Unit conversions (unit_group)
         """
+        convert_config = self.config_dict.get('StdConvert', {}) if self.config_dict else {}
+        
+        # Build the complete section skeleton up front; loops below only fill it in
         config = {
             'MarineDataService': {
                 'enable': 'true',
@@ -1290,83 +1493,62 @@ class MarineDataConfigurator:
                 'log_errors': 'true', 
                 'retry_attempts': '3',
                 'user_latitude': str(getattr(self, 'user_latitude', 33.6595)),
-                'user_longitude': str(getattr(self, 'user_longitude', -117.9988))
+                'user_longitude': str(getattr(self, 'user_longitude', -117.9988)),
+                'selected_stations': {},
+                # CRITICAL: Field selection for service initialization
+                'field_selection': {
+                    'selection_timestamp': str(int(time.time())),
+                    'config_version': '1.0',
+                    'complexity_level': 'custom',
+                    'selected_fields': {}
+                },
+                'field_mappings': {},
+                # CRITICAL: Collection intervals
+                'collection_intervals': dict(DEFAULT_COLLECTION_INTERVALS),
+                # CRITICAL: Unit system configuration
+                'unit_system': {
+                    'weewx_system': convert_config.get('target_unit', 'US')
+                },
+                'api_endpoints': {}
             }
         }
+        service_config = config['MarineDataService']
         
         # CRITICAL: Write selected stations to config
-        selected_stations = config['MarineDataService'].setdefault('selected_stations', {})
+        selected_stations = service_config['selected_stations']
         for module_name, station_list in self.selected_stations.items():
-            station_config = selected_stations.setdefault(module_name.replace('_module', '_stations'), {})
-            for station_id in station_list:
-                station_config[station_id] = 'true'  # String values required
-        
-        # CRITICAL: Write field selection for service initialization
-        field_selection = config['MarineDataService'].setdefault('field_selection', {})
-        field_selection['selection_timestamp'] = str(int(time.time()))
-        field_selection['config_version'] = '1.0'
-        field_selection['complexity_level'] = 'custom'
+            # String values required
+            selected_stations[module_name.replace('_module', '_stations')] = dict.fromkeys(station_list, 'true')
         
         # Group selected fields by module for service
-        selected_field_groups = field_selection.setdefault('selected_fields', {})
-        coops_fields = []
-        ndbc_fields = []
+        selected_field_groups = service_config['field_selection']['selected_fields']
         
         # CRITICAL: Transform YAML fields into runtime field mappings
-        fields = self.yaml_data.get('fields', {})
-        field_mappings = config['MarineDataService'].setdefault('field_mappings', {})
-        
-        for field_name, is_selected in self.selected_fields.items():
-            if is_selected and field_name in fields:
-                field_config = fields[field_name]
-                api_module = field_config.get('api_module', 'unknown_module')
-                
-                # Group fields by module for field_selection
-                if api_module == 'coops_module':
-                    coops_fields.append(field_name)
-                elif api_module == 'ndbc_module':
-                    ndbc_fields.append(field_name)
-                
-                # CRITICAL: Create field mappings for runtime service
-                module_mappings = field_mappings.setdefault(api_module, {})
-                module_mappings[field_name] = {
-                    'database_field': field_config.get('database_field', field_name),
-                    'database_type': field_config.get('database_type', 'REAL'),
-                    'database_table': field_config.get('database_table', 'archive'),
-                    'api_path': field_config.get('api_path', ''),
-                    'unit_group': field_config.get('unit_group', 'group_count'),
-                    'api_product': field_config.get('api_product', ''),
-                    'description': field_config.get('description', '')
-                }
-        
-        # Write grouped field selections
-        if coops_fields:
-            selected_field_groups['coops_module'] = ', '.join(coops_fields)
-        if ndbc_fields:
-            selected_field_groups['ndbc_module'] = ', '.join(ndbc_fields)
-        
-        # CRITICAL: Write collection intervals
-        collection_intervals = config['MarineDataService'].setdefault('collection_intervals', {})
-        collection_intervals['coops_collection_interval'] = '600'      # 10 minutes
-        collection_intervals['tide_predictions_interval'] = '21600'    # 6 hours
-        collection_intervals['ndbc_weather_interval'] = '3600'         # 1 hour
-        collection_intervals['ndbc_ocean_interval'] = '3600'           # 1 hour
-        
-        # CRITICAL: Write unit system configuration
-        unit_system = config['MarineDataService'].setdefault('unit_system', {})
-        convert_config = self.config_dict.get('StdConvert', {}) if self.config_dict else {}
-        weewx_unit_system = convert_config.get('target_unit', 'US')
-        unit_system['weewx_system'] = weewx_unit_system
+        field_mappings = service_config['field_mappings']
+        
+        # Fields are pre-grouped by api_module; keep only the selected ones
+        for api_module, module_fields in self.fields_by_module.items():
+            # CRITICAL: Create field mappings for runtime service (resolved in _index_yaml_data)
+            module_mappings = {field_name: dict(self.field_mappings[field_name])
+                               for field_name, _ in module_fields
+                               if self.selected_fields.get(field_name)}
+            if not module_mappings:
+                continue
+            field_mappings[api_module] = module_mappings
+            
+            # Write grouped field selections straight from the module mapping keys
+            if api_module in ('coops_module', 'ndbc_module'):
+                selected_field_groups[api_module] = ', '.join(module_mappings)
         
         # CRITICAL: Write API endpoints for configurable URLs
-        api_endpoints = config['MarineDataService'].setdefault('api_endpoints', {})
-        api_modules = self.yaml_data.get('api_modules', {})
+        api_endpoints = service_config['api_endpoints']
         
-        for module_name, module_config in api_modules.items():
-            endpoint_config = api_endpoints.setdefault(module_name, {})
-            endpoint_config['base_url'] = module_config.get('api_url', '')
-            endpoint_config['timeout'] = str(module_config.get('timeout', 30))
-            endpoint_config['retry_attempts'] = str(module_config.get('retry_attempts', 3))
+        for module_name, module_config in self.api_modules.items():
+            api_endpoints[module_name] = {
+                'base_url': module_config.get('api_url', ''),
+                'timeout': str(module_config.get('timeout', 30)),
+                'retry_attempts': str(module_config.get('retry_attempts', 3))
+            }
 
         self._write_station_metadata(config)
         
@@ -1376,8 +1558,7 @@ class MarineDataConfigurator:
         """Test actual data content from station's .txt file to determine capabilities."""
         try:
             # Get NDBC configuration from YAML
-            api_modules = self.yaml_data.get('api_modules', {})
-            ndbc_config = api_modules.get('ndbc_module', {})
+            ndbc_config = self.ndbc_config
             
             # Build URL from YAML station_pattern
             station_pattern = ndbc_config.get('station_pattern', '')
@@ -1388,8 +1569,9 @@ class MarineDataConfigurator:
             timeout = ndbc_config.get('timeout', 10)
             
             # Download same file that marine_data.py will parse
-            with urllib.request.urlopen(url, timeout=timeout) as response:
-                content = response.read().decode('utf-8')
+            response = self.session.get(url, timeout=timeout)
+            response.raise_for_status()
+            content = response.content.decode('utf-8')
             
             # Parse same way as marine_data.py
             lines = content.strip().split('\n')
@@ -1406,18 +1588,11 @@ class MarineDataConfigurator:
                     value = data_line[i]
                     available_data[header] = value
             
-            # Group fields by natural sensor type (from .txt file field names)
-            sensor_groups = {
-                'Atmospheric Data': ['WDIR', 'WSPD', 'GST', 'PRES', 'ATMP', 'DEWP', 'VIS'],
-                'Wave Data': ['WVHT', 'DPD', 'APD', 'MWD'], 
-                'Ocean Temperature': ['WTMP']
-            }
-            
             # Test each sensor group for actual data (not "MM", "999.0", "99.0")
             available_capabilities = []
-            missing_indicators = ['MM', '999.0', '99.0', 'MM.']
+            missing_indicators = NDBC_MISSING_INDICATORS
             
-            for capability, field_list in sensor_groups.items():
+            for capability, field_list in NDBC_SENSOR_GROUPS:
                 has_real_data = False
                 
                 for field in field_list:
@@ -1427,7 +1602,7 @@ class MarineDataConfigurator:
                             try:
                                 # Additional check - valid numeric data
                                 float_val = float(value)
-                                if float_val not in [999.0, 99.0, -999.0]:
+                                if float_val not in NDBC_MISSING_VALUES:
                                     has_real_data = True
                                     break
                             except ValueError:
@@ -1467,14 +1642,9 @@ class MarineDataConfigurator:
         """
         Convert bearing in degrees to 16-point cardinal direction
         """
-        directions = [
-            'N', 'NNE', 'NE', 'ENE', 'E', 'ESE', 'SE', 'SSE',
-            'S', 'SSW', 'SW', 'WSW', 'W', 'WNW', 'NW', 'NNW'
-        ]
-        
-        # Each direction covers 22.5 degrees
-        index = round(bearing / 22.5) % 16
-        return directions[index]
+        # Each direction covers 22.5 degrees; bearing is already 0-360,
+        # so truncating after +0.5 rounds and the mask wraps 360 back to N
+        return CARDINAL_DIRECTIONS[int(bearing / 22.5 + 0.5) & 15]
 
     def _write_station_metadata(self, config):
         """